@@ -62,7 +62,7 @@ class Coverage:
                     elif abs(start - e) < 1.0 / self.samplerate + tolerance:
                         # if they do, and this extends previous, replace with maximal span
                         if end > e:
-                            self._log.debug('Joining %d-%d and %d-%d' % (start, end, b, e))
+                            self._log.debug('Joining %d-%d and %d-%d', start, end, b, e)
                             joined[-1] = (b, end)
                     # no they don't overlap
                     else:
@@ -92,7 +92,8 @@ will download, ingest and index data from `dataselect-url` after POSTing
         self._http_timeout = config.arg(HTTPTIMEOUT)
         self._http_retries = config.arg(HTTPRETRIES)
         self._config = config
-        clean_old_files(self._temp_dir, config.arg(TEMPEXPIRE), match_prefixes(TMPDOWNLOAD), self._log)
+        clean_old_files(self._temp_dir, config.arg(TEMPEXPIRE) * 60 * 60 * 24, match_prefixes(TMPDOWNLOAD),
+                        self._log)
 
     def run(self, args):
         """
@@ -1,5 +1,5 @@
 from datetime import datetime
-from os import getpid
+from os import getpid, environ
 from os.path import exists, join
 from re import match
 from shutil import copyfile
@@ -11,7 +11,7 @@ from .lock import DatabaseBasedLockFactory, MSEED
 from .scan import DirectoryScanner
 from .sqlite import SqliteSupport, SqliteContext
 from .utils import run, check_cmd, check_leap, create_parents, safe_unlink, \
-    windows, atomic_move, hash
+    atomic_move, hash
 
 """
 The 'rover ingest' command - copy downloaded data into the repository (and then call index).
@@ -97,12 +97,8 @@ will add all the data in the given file to the repository.
             safe_unlink(self._db_path)
         updated = set()
         try:
-            if windows():
-                run('set LIBMSEED_LEAPSECOND_FILE=%s && %s -sqlite %s %s'
-                    % (self._leap_file, self._mseed_cmd, self._db_path, temp_file), self._log)
-            else:
-                run('LIBMSEED_LEAPSECOND_FILE=%s %s -sqlite %s %s'
-                    % (self._leap_file, self._mseed_cmd, self._db_path, temp_file), self._log)
+            run('%s -sqlite %s %s' % (self._mseed_cmd, self._db_path, temp_file), self._log,
+                env=dict(environ, LIBMSEED_LEAPSECOND_FILE=self._leap_file))
             with SqliteContext(self._db_path, self._log) as db:
                 rows = db.fetchall('''SELECT network, station, starttime, endtime, byteoffset, bytes
                                   FROM tsindex ORDER BY byteoffset''')
@@ -102,7 +102,7 @@ class LockContext(SqliteSupport):
             c.execute('DELETE FROM %s WHERE key = ?' % self._table, (self._key,))
 
     def _clean(self):
-        cleaned = [False]
+        dead = []
 
         def callback(row):
             pid, key, epoch = row
@@ -114,11 +114,15 @@ class LockContext(SqliteSupport):
                 # for the waiting),
                 self._log.debug('Cleaning out old entry for PID %d on lock %s with %s (created %s)' % (
                     pid, self._table, key, format_epoch(epoch)))
-                with self._db:
-                    c = self._db.cursor()
-                    c.execute('BEGIN')
-                    c.execute('DELETE FROM %s WHERE key = ?' % self._table, (self._key,))
-                    cleaned[0] = True
+                dead.append((key, pid))
 
         self.foreachrow('SELECT pid, key, creation_epoch FROM %s' % self._table, tuple(), callback)
-        return cleaned[0]
+        if dead:
+            # delete the dead entries themselves (not our own key) in a single transaction.
+            # matching the pid too means that if the key was cleaned and re-acquired by a
+            # live process since we looked, the new holder's entry is left alone.
+            with self._db:
+                c = self._db.cursor()
+                c.execute('BEGIN')
+                c.executemany('DELETE FROM %s WHERE key = ? AND pid = ?' % self._table, dead)
+        return bool(dead)
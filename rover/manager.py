@@ -887,19 +887,20 @@ class DownloadManager(SqliteSupport):
                         )''')
 
     def _update_stats(self):
+        rows = []
+        for source in self._sources.values():
+            progress = source.stats()
+            rows.append((source.name,
+                         progress.stations[1], progress.stations[1] - progress.stations[0],
+                         progress.seconds[1], max(0, int(progress.seconds[1] - progress.seconds[0])),
+                         source.n_retries, source.download_retries))
         with self._db:  # single transaction
             self._db.cursor().execute('BEGIN')
             self._db.execute('DELETE FROM rover_download_stats', tuple())
-            for source in self._sources.values():
-                progress = source.stats()
-                self._db.execute('''INSERT INTO rover_download_stats
+            self._db.executemany('''INSERT INTO rover_download_stats
                                     (submission, initial_stations, remaining_stations, initial_time, remaining_time,
                                      n_retries, download_retries)
-                                    VALUES (?, ?, ?, ?, ?, ?, ?)''',
-                                 (source.name,
-                                  progress.stations[1], progress.stations[1] - progress.stations[0],
-                                  progress.seconds[1], max(0, int(progress.seconds[1] - progress.seconds[0])),
-                                  source.n_retries, source.download_retries))
+                                    VALUES (?, ?, ?, ?, ?, ?, ?)''', rows)
 
     def _start_web(self):
         if windows():
@@ -74,7 +74,7 @@ class MetadataSource(UserFeedback):
                 db.fetchone(
                     "SELECT name "
                     "FROM sqlite_master "
-                    "WHERE type='table' AND name='tsindex'")
+                    "WHERE type='table' AND name='tsindex'", quiet=True)
                 return True
             except NoResult:
                 return False
@@ -85,7 +85,7 @@ class MetadataSource(UserFeedback):
                 db.fetchone(
                     "SELECT name "
                     "FROM sqlite_master "
-                    "WHERE type='table' AND name='tsindex_summary'")
+                    "WHERE type='table' AND name='tsindex_summary'", quiet=True)
                 return True
             except NoResult:
                 return False
@@ -116,7 +116,7 @@ class ModifiedScanner(SqliteSupport):
         if not exists(self._data_dir):
             makedirs(self._data_dir)
         # pull into memory here to avoid open database when processing
-        dbpaths = PushBackIterator(in_memory(DatabasePathIterator(self._config)))
+        dbpaths = PushBackIterator(iter(in_memory(DatabasePathIterator(self._config))))
         fspaths = RepositoryIterator(self._data_dir)
         while True:
             closed, dblastmod, dbpath, fspath = False, 0, None, None
@@ -9,16 +9,27 @@ Support for database access.
 """
 
 
+# size of the per-connection prepared statement cache (the sqlite3 default is 128).
+# statements are cached by their text, so this only helps when the sql is fixed
+# and values are passed as parameters.
+CACHED_STATEMENTS = 256
+
+
 def init_db(dbpath, log):
     """
     Open a connection to the database.
     """
 
     log.debug('Connecting to sqlite3 %s' % dbpath)
-    db = connect(dbpath, timeout=60.0)
+    db = connect(dbpath, timeout=60.0, cached_statements=CACHED_STATEMENTS)
     # https://www.sqlite.org/foreignkeys.html
     db.execute('PRAGMA foreign_keys = ON')
     db.execute('PRAGMA case_sensitive_like = ON')  # as used by mseedindex
+    db.execute('PRAGMA temp_store = MEMORY')
+    # https://www.sqlite.org/wal.html - with WAL (set by init-repo), NORMAL avoids an fsync
+    # on every commit and is still safe (it is not with the default rollback journal)
+    if db.execute('PRAGMA journal_mode').fetchone()[0] == 'wal':
+        db.execute('PRAGMA synchronous = NORMAL')
     return db
 
 
@@ -28,7 +39,13 @@ class NoResult(Exception):
     """
 
     def __init__(self, sql, params):
-        super().__init__('%s %s' % (sql, params))
+        super().__init__(sql, params)
+        self.sql = sql
+        self.params = params
+
+    def __str__(self):
+        # formatted on demand since callers usually catch and discard
+        return '%s %s' % (self.sql, self.params)
 
 
 class CursorContext:
@@ -47,7 +64,7 @@ class CursorContext:
     def __exit__(self, exc_type, exc_val, exc_tb):
         if exc_type:
             if self._quiet:
-                self._support._log.debug('Cursor exit: %s' % exc_val)
+                self._support._log.debug('Cursor exit: %s', exc_val)
             else:
                 self._support._log.error('Cursor exit: %s' % exc_val)
         else:
@@ -73,17 +90,17 @@ class SqliteDb:
         Execute a single command in a transaction.
         """
         with self.cursor(quiet=quiet) as c:
-            self._log.debug('Execute: %s %s' % (sql, params))
+            self._log.debug('Execute: %s %s', sql, params)
             c.execute(sql, params)
 
     def fetchsingle(self, sql, params=tuple(), quiet=False):
         """
         Return a single value from a select.
 
-        Raise NoResult if no value.
+        Raise NoResult if no value (logged as an error unless quiet).
         """
         with self.cursor(quiet=quiet) as c:
-            self._log.debug('Fetchsingle: %s %s' % (sql, params))
+            self._log.debug('Fetchsingle: %s %s', sql, params)
             result = c.execute(sql, params).fetchone()
             if result:
                 if len(result) > 1:
@@ -97,10 +114,10 @@ class SqliteDb:
         """
         Return a single row from a select.
 
-        Raise NoResult if no row.
+        Raise NoResult if no row (logged as an error unless quiet).
         """
         with self.cursor(quiet=quiet) as c:
-            self._log.debug('Fetchone: %s %s' % (sql, params))
+            self._log.debug('Fetchone: %s %s', sql, params)
             result = c.execute(sql, params).fetchone()
             if result:
                 return result
@@ -115,7 +132,7 @@ class SqliteDb:
         the cursor explicitly (see foreachrow).
         """
         with self.cursor() as c:
-            self._log.debug('Fetchall: %s %s' % (sql, params))
+            self._log.debug('Fetchall: %s %s', sql, params)
             return c.execute(sql, params).fetchall()
 
     def foreachrow(self, sql, params, callback, quiet=False):
@@ -123,7 +140,7 @@ class SqliteDb:
         Call the callback for each row in the results.
         """
         with self.cursor(quiet=quiet) as c:
-            self._log.debug('foreachrow: %s %s' % (sql, params))
+            self._log.debug('foreachrow: %s %s', sql, params)
             for row in c.execute(sql, params):
                 callback(row)
 
@@ -137,7 +154,7 @@ class SqliteContext:
     """
 
     def __init__(self, file, log):
-        self._db = SqliteDb(connect(file, timeout=60.0), log)
+        self._db = SqliteDb(connect(file, timeout=60.0, cached_statements=CACHED_STATEMENTS), log)
 
     def __enter__(self):
         return self._db
@@ -1,19 +1,23 @@
 import ctypes
 import datetime
+import errno
+import math
 import time
 import re
 import codecs
+import heapq
+import shlex
 
-from binascii import hexlify
 from hashlib import sha1
-from os import makedirs, stat, getpid, listdir, unlink, kill, name, rename, rmdir, strerror
-from os.path import dirname, exists, isdir, expanduser, abspath, join, realpath, getmtime
+from os import access, W_OK, makedirs, stat, lstat, getcwd, getpid, listdir, unlink, kill, name, rename, rmdir, strerror
+from os.path import dirname, exists, isdir, isabs, expanduser, expandvars, abspath, join, realpath
 from shutil import move, copyfile
 from subprocess import Popen, check_output, STDOUT
 from sys import version_info
+from zlib import crc32
 
 if version_info[0] >= 3:
-    from os import replace
+    from os import replace, scandir
 
 from requests import __version__ as requests_version, Session
 from requests.adapters import HTTPAdapter
@@ -24,13 +28,29 @@ Assorted utilities.
 """
 
 
+# are we running on windows?  (fixed for the life of the process, so checked once)
+IS_WINDOWS = name in ('Windows', 'nt')
+
+
 def create_parents(path):
     """
     Make sure that the directories in the path exist.
     """
     dir = dirname(path)
-    if not exists(dir):
+    if not isdir(dir):
+        _make_dir(dir)
+
+
+def _make_dir(dir):
+    """
+    Create a directory that did not exist when checked.
+    """
+    try:
         makedirs(dir)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+        # created in parallel (or exists, but is not a directory - checked below)
     if not isdir(dir):
         raise Exception('"%s" is not a directory' % dir)
 
@@ -47,11 +67,16 @@ def safe_unlink(path):
     """
     Delete a file if it exists.
     """
-    if path is not None and exists(path):
+    if path is not None:
         try:
             unlink(path)
-        except PermissionError:
-            pass  # file still in use on windows
+        except OSError as e:  # py2.7 no FileNotFoundError / PermissionError
+            if e.errno == errno.ENOENT:
+                pass  # did not exist
+            elif e.errno in (errno.EACCES, errno.EPERM):
+                pass  # file still in use on windows
+            else:
+                raise
 
 
 def check_cmd(config, param, name):
@@ -60,13 +85,13 @@ def check_cmd(config, param, name):
     """
     from .args import FORCECMD
     value = config.arg(param)
-    if windows() and '/' in value:
+    if IS_WINDOWS and '/' in value:
         config.log.warn('Replacing slashes with back-slashes in "%s"' % value)
-        value = re.sub(r'/', r'\\', value)
+        value = value.replace('/', '\\')
     if not config.arg(FORCECMD):
         cmd = '%s -h' % value
         try:
-            check_output(cmd, stderr=STDOUT, shell=True)
+            check_output(_command_args(cmd), stderr=STDOUT)
             return value
         except Exception as e:
             config.log.error('Command "%s" failed' % cmd)
@@ -77,11 +102,34 @@ def check_cmd(config, param, name):
         return value
 
 
+_CANONIFIED = {}
+_CANONIFIED_MAX = 4096
+
+
 def canonify(path):
     """
     Expand the path so it's repeatable.
+
+    Results are cached (relative paths by working directory, since they depend
+    on that) - use clear_canonify_cache() if links on disk are changed.
+    """
+    expanded = expanduser(path)
+    key = expanded if isabs(expanded) else (getcwd(), expanded)
+    try:
+        return _CANONIFIED[key]
+    except KeyError:
+        if len(_CANONIFIED) >= _CANONIFIED_MAX:
+            _CANONIFIED.clear()
+        canonical = realpath(abspath(expanded))
+        _CANONIFIED[key] = canonical
+        return canonical
+
+
+def clear_canonify_cache():
+    """
+    Forget cached results from canonify().
     """
-    return realpath(abspath(expanduser(path)))
+    _CANONIFIED.clear()
 
 
 def canonify_dir_and_make(path):
@@ -89,25 +137,42 @@ def canonify_dir_and_make(path):
     We need to canonify and make sure some dirs exist.
     """
     path = canonify(path)
-    if not exists(path):
-        makedirs(path)
     if not isdir(path):
-        raise Exception('%s is not a directory')
+        _make_dir(path)
     return path
 
 
-def run(cmd, log, uncouple=False):
+def _command_args(cmd):
+    """
+    Split a command line so that it can be run without a shell.
+    On windows the string is passed directly to CreateProcess, which does its own parsing.
+    Elsewhere, ~ and $VAR are expanded in each argument, as the shell used to do.
+    """
+    if IS_WINDOWS:
+        return cmd
+    else:
+        return [expandvars(expanduser(arg)) for arg in shlex.split(cmd)]
+
+
+# arguments that detach a process from rover (start_new_session doesn't exist for 2.7)
+if version_info[0] >= 3:
+    _POPEN_UNCOUPLE = {'close_fds': True, 'start_new_session': True}
+else:
+    _POPEN_UNCOUPLE = {'close_fds': True}
+
+
+def run(cmd, log, uncouple=False, env=None, stdout=None):
     """
+    Run a command directly (not via a shell, so no redirection, etc).
+
     We can't use subprocess.run() because it doesn't exist for 2.7.
     """
     log.debug('Running "%s"' % cmd)
+    args = _command_args(cmd)
     if uncouple:
-        if version_info[0] >= 3:
-            Popen(cmd, shell=True, close_fds=True, start_new_session=True)
-        else:
-            Popen(cmd, shell=True, close_fds=True)
+        Popen(args, env=env, **_POPEN_UNCOUPLE)
     else:
-        process = Popen(cmd, shell=True)
+        process = Popen(args, env=env, stdout=stdout)
         process.wait()
         if process.returncode:
             raise Exception('Command "%s" failed' % cmd)
@@ -121,13 +186,17 @@ def check_leap(enabled, expire, file, url, timeout, retries, log):
     """
     if enabled:
         file = canonify(file)
-        if exists(file):
+        try:
             statinfo = stat(file)
-            age = int(time.time()) - statinfo.st_atime
+        except OSError as e:  # py2.7 no FileNotFoundError
+            if e.errno != errno.ENOENT:
+                raise
+            download = True
+        else:
+            # modification (download) time - access time is updated each time the file is validated
+            age = time.time() - statinfo.st_mtime
             log.debug('%s is %ds old' % (file, age))
             download = age > expire * 24 * 60 * 60
-        else:
-            download= True
 
         if download:
             get_to_file(url, file, timeout, retries, log, unique=False)
@@ -140,6 +209,10 @@ def check_leap(enabled, expire, file, url, timeout, retries, log):
     else:
         return 'NONE'
 
+
+_LEAP_LINE = re.compile(r'^\d+\s+\d+$')
+
+
 def valid_leapfile(file, log):
     """
     Perform simple validation of an IETF leap second file.
@@ -153,8 +226,6 @@ def valid_leapfile(file, log):
 
     Returns the file name on success or None if an unrecognized line is found
     """
-    twodigits = re.compile("^\d+\s+\d+$")
-
     with open(file) as fp:
         for line in fp.readlines():
             trimmed = line.partition('#')[0].rstrip('\n\r').rstrip()
@@ -162,7 +233,7 @@ def valid_leapfile(file, log):
             if len(trimmed) == 0:
                 continue
 
-            if not twodigits.match(trimmed):
+            if not _LEAP_LINE.match(trimmed):
                 log.warning('Unrecognized line in leap second file: "%s"' % line.rstrip('\n\r'))
                 return None
 
@@ -172,9 +243,17 @@ def hash(text):
     """
     SHA1 hash as hex.
     """
-    hash = sha1()
-    hash.update(text.encode('utf-8'))
-    return hexlify(hash.digest()).decode('ascii')
+    # surrogatepass so that paths decoded with surrogateescape can still be hashed
+    return sha1(text.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def short_hash(text):
+    """
+    Six hex digits from a CRC32 of the text (cheaper than SHA1 when only used
+    to vary file names).
+    """
+    return '%06x' % (crc32(text.encode('utf-8', 'surrogatepass')) & 0xffffff)
+
 
 def uniqueish(prefix, salt, pid=None):
     """
@@ -182,7 +261,7 @@ def uniqueish(prefix, salt, pid=None):
     """
     if pid is None:
         pid = getpid()
-    return '%s_%s_%d' % (prefix, hash(salt)[:6], pid)
+    return '%s_%s_%d' % (prefix, short_hash(salt), pid)
 
 
 def unique_filename(path):
@@ -218,16 +297,29 @@ def _stream_output(request, down, unique=True):
         if unique:
             down = unique_filename(down)
         with open(down, 'wb') as output:
-            for chunk in request.iter_content(chunk_size=1024):
+            # large chunks keep the per-chunk python overhead small relative to the data
+            for chunk in request.iter_content(chunk_size=128 * 1024):
                 if chunk:
                     output.write(chunk)
         return down, request.raise_for_status
 
 
+_SESSIONS = {}
+
+
 def _session(retries):
+    """
+    Return a session for the given number of retries, re-using any existing
+    session so that connections to the same server are kept alive.
+    """
+    if retries not in _SESSIONS:
+        _SESSIONS[retries] = _new_session(retries)
+    return _SESSIONS[retries]
+
+
+def _new_session(retries):
     """
     Ugliness required by requests lib to set max retries.
-    (We don't really care about efficiency to the point where we need to re-use the session)
     """
     # https://stackoverflow.com/questions/21371809/cleanly-setting-max-retries-on-python-requests-get-or-post-method
     session = Session()
@@ -281,14 +373,31 @@ def clean_old_files(dir, age_secs, match, log):
     """
     Delete old files that match the predicate.
     """
-    if exists(dir):
-        for file in listdir(dir):
-            if match(file):
+    if isdir(dir):
+        now = time.time()
+        for entry_name, path, stat_entry in _dir_entries(dir):
+            if match(entry_name):
                 try:
-                    if time.time() - getmtime(file) > age_secs:
-                        log.warn('Deleting old %s' % file)
-                except:   # py2.7 no FileNotFound
-                    pass  # was deleted from under us
+                    if now - stat_entry().st_mtime > age_secs:
+                        log.warn('Deleting old %s' % path)
+                        unlink(path)
+                except OSError as e:  # py2.7 no FileNotFoundError
+                    if e.errno != errno.ENOENT:  # otherwise, was deleted from under us
+                        log.warn('Could not delete %s: %s' % (path, strerror(e.errno)))
+
+
+def _dir_entries(dir):
+    """
+    (name, path, stat) for each entry in the directory, where stat() returns
+    the entry's lstat.  Uses os.scandir (which caches stat where it can) if available.
+    """
+    if version_info[0] >= 3:
+        for entry in scandir(dir):
+            yield entry.name, entry.path, lambda entry=entry: entry.stat(follow_symlinks=False)
+    else:
+        for entry_name in listdir(dir):
+            path = join(dir, entry_name)
+            yield entry_name, path, lambda path=path: lstat(path)
 
 
 def match_prefixes(*prefixes):
@@ -303,6 +412,10 @@ def match_prefixes(*prefixes):
     return match
 
 
+# marks "nothing pushed" (so that any value, including None or 0, can be pushed back)
+_NOTHING = object()
+
+
 class PushBackIterator:
     """
     Modify an iterator so that a (single) value can be pushed back
@@ -311,10 +424,10 @@ class PushBackIterator:
 
     def __init__(self, iter):
         self._iter = iter
-        self._pushed = None
+        self._pushed = _NOTHING
 
     def push(self, value):
-        if self._pushed:
+        if self._pushed is not _NOTHING:
             raise Exception('Cannot push multiple values')
         self._pushed = value
 
@@ -322,10 +435,10 @@ class PushBackIterator:
         return self
 
     def __next__(self):
-        if self._pushed:
-            value, self._pushed = self._pushed, None
-        else:
-            value = next(self._iter)
+        value = self._pushed
+        if value is _NOTHING:
+            return next(self._iter)
+        self._pushed = _NOTHING
         return value
 
 
@@ -350,11 +463,14 @@ EPOCH = datetime.datetime.utcfromtimestamp(0)
 EPOCH_UTC = EPOCH.replace(tzinfo=utc)
 
 
+_VALID_TIME = re.compile(r'^\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}:\d{2}(\.\d+)?)?$')
+
+
 def assert_valid_time(log, time):
     """
     Check timestamp format.
     """
-    if re.match(r'^\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}:\d{2}(\.\d+)?)?$', time):
+    if _VALID_TIME.match(time):
         return time
     else:
         msg = 'Invalid time format "%s"' % time
@@ -362,20 +478,52 @@ def assert_valid_time(log, time):
         raise Exception(msg)
 
 
+def _civil_from_days(days):
+    """
+    Year, month and day for days since the epoch (UTC, proleptic Gregorian).
+    http://howardhinnant.github.io/date_algorithms.html#civil_from_days
+    """
+    z = days + 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + 3 if mp < 10 else mp - 9
+    return yoe + era * 400 + (month <= 2), month, day
+
+
+def _split_epoch(epoch):
+    """
+    (year, month, day, hour, minute, second, microsecond) for an epoch, in UTC.
+    Microseconds are rounded as datetime.fromtimestamp() does, so that the
+    formatted values are unchanged.
+    """
+    fraction, seconds = math.modf(epoch)
+    micros = round(fraction * 1e6)
+    if micros >= 1000000:
+        seconds, micros = seconds + 1, micros - 1000000
+    elif micros < 0:
+        seconds, micros = seconds - 1, micros + 1000000
+    days, seconds = divmod(int(seconds), 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return _civil_from_days(days) + (hours, minutes, seconds, int(micros))
+
+
 def format_epoch(epoch):
     """
     Format an epoch in the standard format.
     """
-    dt = datetime.datetime.fromtimestamp(epoch, utc)
-    return datetime.datetime.strftime(dt, '%Y-%m-%dT%H:%M:%S.%f')
+    return '%04d-%02d-%02dT%02d:%02d:%02d.%06d' % _split_epoch(epoch)
 
 
 def format_day_epoch(epoch):
     """
     Format an epoch as a date, without time.
     """
-    dt = datetime.datetime.fromtimestamp(epoch, utc)
-    return datetime.datetime.strftime(dt, '%Y-%m-%d')
+    return '%04d-%02d-%02d' % _split_epoch(epoch)[:3]
 
 
 def format_year_day_epoch(epoch):
@@ -390,8 +538,7 @@ def format_time_epoch(epoch):
     """
     Format an epoch, with time to seconds
     """
-    dt = datetime.datetime.fromtimestamp(epoch, utc)
-    return datetime.datetime.strftime(dt, '%Y-%m-%dT%H:%M:%S')
+    return '%04d-%02d-%02dT%02d:%02d:%02d' % _split_epoch(epoch)[:6]
 
 
 def format_time_epoch_local(epoch):
@@ -402,22 +549,23 @@ def format_time_epoch_local(epoch):
     return datetime.datetime.strftime(dt, '%Y-%m-%dT%H:%M:%S')
 
 
+# the formats accepted by parse_epoch() (fields are range-checked by datetime).
+# like strptime, the T is case-insensitive and the day may be space-padded.
+_EPOCH_FORMAT = re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2}| \d)(?:[Tt](\d{1,2}):(\d{1,2})(?::(\d{1,2})(?:\.(\d{1,6}))?)?)?Z?\Z')
+
+
 def parse_epoch(date):
     """
     Parse a date in the standard formats
-    """
-    if date.endswith('Z'):
-        date = date[:-1]
-    try:
-        dt = datetime.datetime.strptime(date, '%Y-%m-%dT%H:%M:%S.%f')
-    except ValueError:
-        try:
-            dt = datetime.datetime.strptime(date, '%Y-%m-%dT%H:%M:%S')
-        except ValueError:
-            try:
-                dt = datetime.datetime.strptime(date, '%Y-%m-%dT%H:%M')
-            except ValueError:
-                dt = datetime.datetime.strptime(date, '%Y-%m-%d')
+    (%Y-%m-%d with optional T%H:%M, :%S and .%f, and an optional trailing Z)
+    """
+    match = _EPOCH_FORMAT.match(date)
+    if not match:
+        raise ValueError('Unsupported date format "%s"' % date)
+    year, month, day, hour, minute, second, fraction = match.groups()
+    dt = datetime.datetime(int(year), int(month), int(day),
+                           int(hour or 0), int(minute or 0), int(second or 0),
+                           int(fraction.ljust(6, '0')) if fraction else 0)
     return (dt - EPOCH).total_seconds()
 
 
@@ -435,9 +583,9 @@ def tidy_timestamp(log, timestamp):
 
 def in_memory(iterator):
     """
-    Pull an entire iterator into memory and then re-expose as an iterator.
+    Pull an entire iterator into memory (returns a list).
     """
-    return iter(list(iterator))
+    return list(iterator)
 
 
 STATION = 'station'
@@ -451,6 +599,20 @@ def build_file(log, path, args):
     Given a N_S_L_C or net=... and start/end times, construct an input file in
     the correct (availability service) format.
     """
+    build_file_many(log, path, [args])
+
+
+def build_file_many(log, path, arg_lists):
+    """
+    As build_file(), but with one line for each list of arguments (the file
+    is opened and written just once).
+    """
+    lines = [_build_line(args) for args in arg_lists]
+    with open(path, 'w') as req:
+        req.write(''.join(line + '\n' for line in lines))
+
+
+def _build_line(args):
     # just go crazy because any error is caught by the caller and changed into a 'bad syntax' error
     if '_' in args[0]:
         (n, s, l, c) = (code if code else '--' for code in args[0].split('_'))
@@ -468,8 +630,7 @@ def build_file(log, path, args):
     assert len(args) < 3
     parts = [sncl[NETWORK], sncl[STATION], sncl[LOCATION], sncl[CHANNEL]]
     parts += args
-    with open(path, 'w') as req:
-        print(' '.join(parts), file=req)
+    return ' '.join(parts)
 
 
 def sort_file_inplace(log, path, temp_dir, sort_in_python):
@@ -484,52 +645,98 @@ def sort_file_inplace(log, path, temp_dir, sort_in_python):
     except Exception as e:
         log.warn('OS sorting failed (%s) using python fallback' % e)
     if not done:
-        _python_sort(log, path)
+        _python_sort(log, path, temp_dir)
 
 
-def _python_sort(log, path):
-    log.debug('Sorting %s in memory' % path)
-    with open(path, 'r') as source:
-        lines = source.readlines()
-    with open(path, 'w') as dest:
-        for line in sorted(lines):
-            print(line.rstrip(), file=dest)
+# approximate size (bytes) of the chunks sorted in memory by _python_sort()
+PYTHON_SORT_CHUNK = 64 * 1024 * 1024
+
+
+def _python_sort(log, path, temp_dir):
+    """
+    Merge sort on disk - chunks are sorted in memory and written to temporary
+    files, which are then merged back into the original file.
+    """
+    log.debug('Sorting %s in python' % path)
+    chunks = []
+    try:
+        with open(path, 'r') as source:
+            while True:
+                lines = source.readlines(PYTHON_SORT_CHUNK)
+                if not lines:
+                    break
+                if not lines[-1].endswith('\n'):
+                    lines[-1] += '\n'  # so that it merges consistently with the other lines
+                lines.sort()
+                chunk = unique_path(temp_dir, 'rover_sort_chunk', '%s %d' % (path, len(chunks)))
+                with open(chunk, 'w') as dest:
+                    dest.writelines(lines)
+                chunks.append(chunk)
+        sources = [open(chunk, 'r') for chunk in chunks]
+        try:
+            with open(path, 'w') as dest:
+                for line in heapq.merge(*sources):
+                    print(line.rstrip(), file=dest)
+        finally:
+            for source in sources:
+                source.close()
+    finally:
+        for chunk in chunks:
+            safe_unlink(chunk)
 
 
 def _os_sort(log, path, temp_dir):
-    sorted_path = unique_path(temp_dir, 'rover_sort', path)
+    # sort alongside the original where possible, so that replacing it is a
+    # (same filesystem) rename rather than a copy
+    dir = dirname(path) or '.'
+    same_dir = access(dir, W_OK)
+    sorted_path = unique_path(dir if same_dir else temp_dir, 'rover_sort', path)
     log.debug('Sorting %s into %s' % (path, sorted_path))
-    run('sort %s > %s' % (path, sorted_path), log)
-    safe_unlink(path)
-    move(sorted_path, path)
+    try:
+        with open(sorted_path, 'w') as output:
+            run('sort %s' % path, log, stdout=output)
+        if same_dir:
+            atomic_move(log, sorted_path, path)
+        else:
+            safe_unlink(path)
+            move(sorted_path, path)
+    finally:
+        safe_unlink(sorted_path)
 
 
-def process_exists(pid):
+def _process_exists_windows(pid):
     """
     Check whether the given PID exists.
     """
-    if windows():
-        # https://stackoverflow.com/questions/17620833/check-if-pid-exists-on-windows-with-python-without-requiring-libraries
-        kernel32 = ctypes.windll.kernel32
-        process = kernel32.OpenProcess(0x100000, 0, pid)
-        if process:
-            kernel32.CloseHandle(process)
-            return True
-        else:
-            return False
+    # https://stackoverflow.com/questions/17620833/check-if-pid-exists-on-windows-with-python-without-requiring-libraries
+    kernel32 = ctypes.windll.kernel32
+    process = kernel32.OpenProcess(0x100000, 0, pid)
+    if process:
+        kernel32.CloseHandle(process)
+        return True
     else:
-        try:
-            kill(pid, 0)
-            return True
-        except OSError:
-            return False
+        return False
+
+
+def _process_exists_posix(pid):
+    """
+    Check whether the given PID exists.
+    """
+    try:
+        kill(pid, 0)
+        return True
+    except OSError:
+        return False
+
+
+process_exists = _process_exists_windows if IS_WINDOWS else _process_exists_posix
 
 
 def windows():
     """
     Are we running on windows?
     """
-    return name in ('Windows', 'nt')
+    return IS_WINDOWS
 
 
 def diagnose_error(log, error, request, response, copied=True):
@@ -554,6 +761,7 @@ def log_file_contents(path, log, max_lines=10):
     count = 0
     try:
         with codecs.open(path, encoding='utf-8', errors='strict') as input:
+            # log as we read, so that lines before any undecodable data are shown
             for line in input:
                 line = line.strip()
                 if line:
@@ -564,7 +772,12 @@ def log_file_contents(path, log, max_lines=10):
     except UnicodeDecodeError:
         log.error('File contents are not printable.')
     except IOError as e:
-        log.error('Error opening file:', strerror(e.errno))
+        log.error('Error opening file: %s' % strerror(e.errno))
+
+
+_SIZE_SUFFIXES = {'k': 1024, 'K': 1024,
+                  'm': 1024 * 1024, 'M': 1024 * 1024,
+                  'g': 1024 * 1024 * 1024, 'G': 1024 * 1024 * 1024}
 
 
 def calc_bytes(sizestring):
@@ -579,16 +792,9 @@ def calc_bytes(sizestring):
 
     Returns a size in bytes.
     """
-
-    if sizestring.endswith('k') or sizestring.endswith('K'):
-        return int(sizestring[:-1]) * 1024
-
-    elif sizestring.endswith('m') or sizestring.endswith('M'):
-        return int(sizestring[:-1]) * 1024 * 1024
-
-    elif sizestring.endswith('g') or sizestring.endswith('G'):
-        return int(sizestring[:-1]) * 1024 * 1024 * 1024
-
+    scale = _SIZE_SUFFIXES.get(sizestring[-1:])
+    if scale:
+        return int(sizestring[:-1]) * scale
     else:
         return int(sizestring)
 
@@ -597,6 +803,10 @@ def null_fixer(log, line):
     return line
 
 
+# Acceptable source identifier codes contain only these characters
+_ACCEPTABLE_CODE = re.compile(r'[-_,A-Za-z0-9*?]')
+
+
 def iris_fixer(log, line):
     """
     Tidy and validate a request file line as used by the retrieve command.
@@ -623,19 +833,16 @@ def iris_fixer(log, line):
     if len(fields) != 6:
         raise Exception ("Unrecognized request line, not enough fields: '%s'" % line)
 
-    # Acceptable source identifier codes contain only these characters
-    acceptable_code = "[-_,A-Za-z0-9*?]"
-
-    if not re.match(acceptable_code, fields[0]):
+    if not _ACCEPTABLE_CODE.match(fields[0]):
         raise Exception ("Unrecognized request line, invalid network code: '%s'" % line)
 
-    if not re.match(acceptable_code, fields[1]):
+    if not _ACCEPTABLE_CODE.match(fields[1]):
         raise Exception ("Unrecognized request line, invalid station code: '%s'" % line)
 
-    if not re.match(acceptable_code, fields[2]):
+    if not _ACCEPTABLE_CODE.match(fields[2]):
         raise Exception ("Unrecognized request line, invalid location code: '%s'" % line)
 
-    if not re.match(acceptable_code, fields[3]):
+    if not _ACCEPTABLE_CODE.match(fields[3]):
         raise Exception ("Unrecognized request line, invalid channel code: '%s'" % line)
 
     # Tidy time values, allowing '*' as an exception (meaning "open" time)
@@ -682,7 +889,7 @@ def atomic_move(log, src, dest):
         log.debug('Moving %s to %s (atomic 3)' % (src, dest))
         replace(src, dest)
     else:
-        if windows():
+        if IS_WINDOWS:
             log.debug('Moving %s to %s (windows)' % (src, dest))
             exception = None
             while exists(src):
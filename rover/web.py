@@ -138,7 +138,8 @@ Last active: %s (%s local)</pre></p>''' %
             initial_stations, remaining_stations, initial_time, remaining_time, n_retries, download_retries = \
                 self.server.fetchone('''SELECT initial_stations, remaining_stations, initial_time, remaining_time,
                                                n_retries, download_retries
-                                          FROM rover_download_stats WHERE submission = ?''', (name,))
+                                          FROM rover_download_stats WHERE submission = ?''', (name,),
+                                      quiet=True)
             self._write('<p>Progress for download attempt %d of %d:<pre>\n' % (n_retries, download_retries))
             self._write_bar('stations', initial_stations, remaining_stations)
             self._write_bar('timespan', initial_time, remaining_time)
@@ -0,0 +1,47 @@
+
+from os import getpid, getppid
+from subprocess import Popen
+from sys import executable, version_info
+
+if version_info[0] >= 3:
+    from tempfile import TemporaryDirectory
+else:
+    from backports.tempfile import TemporaryDirectory
+
+from rover.lock import DatabaseBasedLockFactory, LockContext
+
+from .test_utils import WindowsTemp, TestConfig
+
+
+TABLE = 'rover_lock_test'
+
+
+def dead_pid():
+    process = Popen([executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+class RacingLockContext(LockContext):
+    """
+    Simulate another process cleaning out a dead entry and re-acquiring the
+    key between our scan for dead entries and our delete.
+    """
+
+    def foreachrow(self, *args, **kargs):
+        super().foreachrow(*args, **kargs)
+        self.execute('DELETE FROM %s WHERE key = ?' % TABLE, ('racing',))
+        self.execute('INSERT INTO %s (pid, key) VALUES (?, ?)' % TABLE, (getpid(), 'racing'))
+
+
+def test_clean_dead_only():
+    with WindowsTemp(TemporaryDirectory) as dir:
+        config = TestConfig(dir)
+        DatabaseBasedLockFactory(config, 'test')
+        for key, pid in (('other', dead_pid()), ('racing', dead_pid()), ('mine', getppid())):
+            config.db.execute('INSERT INTO %s (pid, key) VALUES (?, ?)' % TABLE, (pid, key))
+        config.db.commit()
+        assert RacingLockContext(config, TABLE, 'mine', None)._clean()
+        rows = sorted(config.db.execute('SELECT key, pid FROM %s' % TABLE))
+        assert rows == [('mine', getppid()), ('racing', getpid())], rows
+        assert not LockContext(config, TABLE, 'mine', None)._clean()
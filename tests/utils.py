@@ -1,5 +1,7 @@
 
+from os import listdir, getcwd, chdir, mkdir, utime, chmod, environ
 from os.path import join, exists
+from time import time
 from sys import version_info
 
 if version_info[0] >= 3:
@@ -7,11 +9,13 @@ if version_info[0] >= 3:
 else:
     from backports.tempfile import TemporaryDirectory
 
-from rover.args import DEFAULT_LEAPURL, DEFAULT_LEAPEXPIRE, DEFAULT_HTTPTIMEOUT, DEFAULT_HTTPRETRIES
+from rover.args import DEFAULT_LEAPURL, DEFAULT_LEAPEXPIRE, DEFAULT_HTTPTIMEOUT, DEFAULT_HTTPRETRIES, ROVERCMD
 from rover.logs import init_log
-from rover.utils import check_leap, tidy_timestamp
+import rover.utils
+from rover.utils import check_leap, tidy_timestamp, sort_file_inplace, PushBackIterator, \
+    clean_old_files, match_prefixes, build_file_many, run, check_cmd, windows
 
-from .test_utils import WindowsTemp
+from .test_utils import WindowsTemp, TestConfig
 
 
 def test_download_leap():
@@ -33,3 +37,85 @@ def test_tidy_timestamp():
         assert_timestamp(log, '2018-7-4', '2018-07-04T00:00:00.000000')
         assert_timestamp(log, '2018-7-4T1:2:3.456', '2018-07-04T01:02:03.456000')
         assert_timestamp(log, '2018-7-4T1:3', '2018-07-04T01:03:00.000000')
+        assert_timestamp(log, '2018-01-01t01:02:03', '2018-01-01T01:02:03.000000')
+        assert_timestamp(log, '2018-01- 1', '2018-01-01T00:00:00.000000')
+
+
+def test_python_sort():
+    with WindowsTemp(TemporaryDirectory) as dir:
+        log = init_log(dir, '7M', 1, 5, 0, 'test', False, 0)[0]
+        path = join(dir, 'unsorted.txt')
+        with open(path, 'w') as output:
+            output.write('d 4\nb 2\ne 5\na 1\nc 3')
+        chunk = rover.utils.PYTHON_SORT_CHUNK
+        rover.utils.PYTHON_SORT_CHUNK = 8  # force multiple chunks
+        try:
+            sort_file_inplace(log, path, dir, True)
+        finally:
+            rover.utils.PYTHON_SORT_CHUNK = chunk
+        with open(path, 'r') as input:
+            assert input.read() == 'a 1\nb 2\nc 3\nd 4\ne 5\n'
+        assert not [file for file in listdir(dir) if file.startswith('rover_sort_chunk')], listdir(dir)
+
+
+def test_push_back_falsy():
+    values = PushBackIterator(iter([0, 1]))
+    value = next(values)
+    values.push(value)
+    assert list(values) == [0, 1]
+
+
+def test_clean_old_files():
+    with WindowsTemp(TemporaryDirectory) as dir:
+        log = init_log(dir, '7M', 1, 5, 0, 'test', False, 0)[0]
+        temp = join(dir, 'temp')
+        mkdir(temp)
+        for file in ('rover_old', 'rover_new', 'other_old'):
+            open(join(temp, file), 'w').close()
+        old = time() - 1000
+        utime(join(temp, 'rover_old'), (old, old))
+        utime(join(temp, 'other_old'), (old, old))
+        cwd = getcwd()
+        chdir(dir)
+        try:
+            clean_old_files('temp', 100, match_prefixes('rover_'), log)  # relative dir
+        finally:
+            chdir(cwd)
+        assert sorted(listdir(temp)) == ['other_old', 'rover_new'], listdir(temp)
+
+
+def test_build_file_many():
+    with WindowsTemp(TemporaryDirectory) as dir:
+        path = join(dir, 'request')
+        build_file_many(None, path, [['IU_ANMO_00_BHZ', '2010-01-01'], ['net=TA', 'cha=BH?']])
+        with open(path) as input:
+            text = input.read()
+        assert text == 'IU ANMO 00 BHZ 2010-01-01\nTA * * BH?\n', text
+        build_file_many(None, path, [])
+        with open(path) as input:
+            text = input.read()
+        assert text == '', text
+
+
+def test_run_expands_home():
+    if not windows():  # test command is a shell script
+        with WindowsTemp(TemporaryDirectory) as dir:
+            cmd = join(dir, 'cmd')
+            with open(cmd, 'w') as output:
+                output.write('#!/bin/sh\necho "$@" > "$(dirname "$0")/out"\n')
+            chmod(cmd, 0o755)
+            home = environ.get('HOME')
+            environ['HOME'] = dir
+            try:
+                log = init_log(dir, '7M', 1, 5, 0, 'test', False, 0)[0]
+                run('~/cmd $HOME', log)
+                with open(join(dir, 'out')) as input:
+                    text = input.read()
+                assert text == dir + '\n', text
+                config = TestConfig(dir, rover_cmd='~/cmd')
+                assert check_cmd(config, ROVERCMD, 'rover') == '~/cmd'
+            finally:
+                if home is None:
+                    del environ['HOME']
+                else:
+                    environ['HOME'] = home